@@ -1,4 +1,5 @@
 import asyncio
+import os
 from typing import Any
 from src.models.task import TaskInstance
 from src.publisher.client import PublisherClient
@@ -17,6 +18,10 @@ manager_config = ManagerConfig(url="http://localhost:3000")
 TASK_1_NAME = "task_1"
 TASK_2_NAME = "task_2"
 
+# Seconds of simulated work per task. `asyncio.sleep(0)` still yields to the
+# event loop, so set `DEMO_DELAY=0` to run the example without waiting (e.g. CI).
+DEMO_DELAY = float(os.getenv("DEMO_DELAY", "1.0"))
+
 # APPLICATION CONFIGURATION ___________________________________________________
 
 # 1. Configure the manager & broker
@@ -37,7 +42,7 @@ worker_application = WorkerApplication(worker_config)
 
 @worker_application.task(TASK_1_NAME)
 async def task_1(input_data: dict[Any, Any]) -> dict[Any, Any]:
-    await asyncio.sleep(1)
+    await asyncio.sleep(DEMO_DELAY)
     return input_data
 
 
@@ -60,9 +65,17 @@ async def get_completed_task() -> TaskInstance:
     # Get the task result
     task_instance = await publisher_client.get_task(task_instance.id, long_poll=True)
 
+    await publisher_client.close()
+
     return task_instance
 
 
 if __name__ == "__main__":
-    result = asyncio.run(get_completed_task())
+    try:
+        # uvloop is a faster drop-in event loop, installed with `speedups`
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+
+    result = run(get_completed_task())
     print(result)
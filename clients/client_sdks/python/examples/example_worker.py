@@ -1,4 +1,5 @@
 import asyncio
+import os
 from typing import Any
 
 from broker import BrokerConfig
@@ -19,6 +20,10 @@ broker_config = BrokerConfig(
 TASK_1_NAME = "task_1"
 TASK_2_NAME = "task_2"
 
+# Seconds of simulated work per task. `asyncio.sleep(0)` still yields to the
+# event loop, so set `DEMO_DELAY=0` to run the example without waiting (e.g. CI).
+DEMO_DELAY = float(os.getenv("DEMO_DELAY", "1.0"))
+
 # APPLICATION CONFIGURATION ___________________________________________________
 
 # 2. Configure the worker
@@ -36,7 +41,7 @@ worker_application = WorkerApplication(worker_config)
 
 @worker_application.task(TASK_1_NAME)
 async def task_1(input_data: dict[Any, Any]) -> dict[Any, Any]:
-    await asyncio.sleep(1)
+    await asyncio.sleep(DEMO_DELAY)
     return input_data
 
 
@@ -46,4 +51,10 @@ async def task_2(input_data: dict[Any, Any]) -> dict[Any, Any]:
 
 
 if __name__ == "__main__":
-    asyncio.run(worker_application.entrypoint())
+    try:
+        # uvloop is a faster drop-in event loop, installed with `speedups`
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+
+    run(worker_application.entrypoint())
@@ -3,6 +3,17 @@ from dataclasses import dataclass
 
 @dataclass
 class BrokerConfig:
-    """Configuration for a broker."""
+    """Configuration for a broker.
+
+    ### Attributes
+    - `url`: The URL of the broker.
+    - `prefetch_count`: Maximum number of unacknowledged messages the broker
+      will push to the worker at once. Tasks are acknowledged once processed,
+      so this also bounds how many tasks a worker holds at a time.
+    - `ack_batch_size`: Maximum number of processed messages acknowledged
+      together in a single `ack(multiple=True)`.
+    """
 
     url: str
+    prefetch_count: int = 64
+    ack_batch_size: int = 32
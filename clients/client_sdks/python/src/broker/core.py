@@ -17,3 +17,8 @@ class BrokerClient(ABC):
     async def listen(self) -> AsyncGenerator[Tuple[str, str, str], None]:
         """Listen to the worker queue."""
         pass
+
+    @abstractmethod
+    async def ack(self, task_id: str) -> None:
+        """Acknowledge a received task once it has been fully processed."""
+        pass
@@ -1,8 +1,12 @@
-import json
-from typing import AsyncGenerator, Tuple
+import asyncio
+from collections import OrderedDict
+from typing import AsyncGenerator, Optional, Tuple
+
+import orjson
 from broker.config import BrokerConfig
 from broker.core import BrokerClient
 from aio_pika import connect_robust
+from aio_pika.abc import AbstractIncomingMessage, AbstractQueue
 
 
 class RabbitMQBroker(BrokerClient):
@@ -15,12 +19,27 @@ class RabbitMQBroker(BrokerClient):
         connection: Active connection to RabbitMQ server
         channel: Active channel for communication
         exchange: Declared exchange for message routing
+        queue: Declared worker queue, reused across calls to `listen`
     """
 
+    _messages: Optional[asyncio.Queue[AbstractIncomingMessage]]
+    _deliveries: OrderedDict[str, AbstractIncomingMessage]
+    _last_finished: Optional[AbstractIncomingMessage]
+    _unacked: int
+
     def __init__(self, config: BrokerConfig, exchange_name: str, worker_id: str):
         self.config = config
         self.exchange_name = exchange_name
         self.worker_id = worker_id  # Add worker_id to identify this worker
+        self.queue: Optional[AbstractQueue] = None
+
+        # Received tasks that were not acked yet, in delivery order
+        self._messages = None
+        self._deliveries = OrderedDict()
+
+        # Newest message whose delivery tag and all older ones can be acked
+        self._last_finished = None
+        self._unacked = 0
 
     async def connect(self) -> None:
         """Establish connection to RabbitMQ server and setup channel.
@@ -29,29 +48,104 @@ class RabbitMQBroker(BrokerClient):
         - `ConnectionError`: If connection to RabbitMQ fails
         """
         self.connection = await connect_robust(self.config.url)
-        self.channel = await self.connection.channel()
+        # This channel only consumes, so skip the confirm.select handshake
+        self.channel = await self.connection.channel(publisher_confirms=False)
+        await self.channel.set_qos(prefetch_count=self.config.prefetch_count)
+        self.queue = None
+
+        # Delivery tags are per channel, older deliveries can no longer be acked
+        self._deliveries.clear()
+        self._last_finished, self._unacked = None, 0
 
     async def disconnect(self) -> None:
         """Close RabbitMQ connection."""
         # Remove the exchanges
         await self.connection.close()
 
+    async def _get_queue(self) -> AbstractQueue:
+        """Declare the worker queue once per channel and reuse it afterwards."""
+        if self.queue is None:
+            # The queue should have been created sucessfully on the gateway side
+            # The queue name should be the id of the worker
+            self.queue = await self.channel.declare_queue(
+                self.worker_id, durable=False
+            )
+        return self.queue
+
     async def listen(self) -> AsyncGenerator[Tuple[str, str, str], None]:
         """Listen for tasks of a specific type.
 
+        A received task is only acknowledged once it is passed to `ack`, so
+        tasks that were not fully processed are redelivered if the worker
+        dies. When listening stops, messages that were received but never
+        yielded are requeued.
+
         ### Yields
         - `str`: Decoded message body containing task data
 
         ### Raises
         - `ConnectionError`: If broker connection is lost
         """
-        # The queue should have been created sucessfully on the gateway side
-        # The queue name should be the id of the worker
-        queue_instance = await self.channel.declare_queue(self.worker_id, durable=False)
+        queue_instance = await self._get_queue()
+
+        messages: asyncio.Queue[AbstractIncomingMessage] = asyncio.Queue()
+        consumer_tag = await queue_instance.consume(messages.put)
+        self._messages = messages
+
+        deliveries = self._deliveries
+
+        try:
+            while True:
+                message = await messages.get()
+                deliveries[message.message_id] = message
 
-        async for message in queue_instance.iterator():
-            async with message.process():
                 task_kind = message.headers.get("task_kind")
-                yield json.loads(message.body.decode()), message.message_id, task_kind
+                yield orjson.loads(message.body), message.message_id, task_kind
+        finally:
+            await queue_instance.cancel(consumer_tag)
+
+            # Hand back anything that was delivered but never processed
+            while not messages.empty():
+                await messages.get_nowait().nack(requeue=True)
+
+            await self._flush_acks()
+
+    async def ack(self, task_id: str) -> None:
+        """Acknowledge a received task once it has been fully processed.
+
+        Tasks can finish in any order. A task that finishes before an older
+        one is acked on its own right away, so a slow task never holds back
+        the acknowledgements of the ones received after it. Runs of tasks that
+        finish while being the oldest received are batched instead: they are
+        acked together with one `ack(multiple=True)` whenever `ack_batch_size`
+        of them are pending or no further message is waiting to be processed.
+
+        ### Parameters
+        - `task_id`: Id of the task, as yielded by `listen`
+        """
+        deliveries = self._deliveries
+        if task_id not in deliveries:
+            return
+
+        if next(iter(deliveries)) != task_id:
+            # An older task is still being processed, ack this one alone
+            await deliveries.pop(task_id).ack()
+            return
+
+        self._last_finished = deliveries.pop(task_id)
+        self._unacked += 1
+
+        if (
+            self._unacked >= self.config.ack_batch_size
+            or not deliveries
+            or self._messages is None
+            or self._messages.empty()
+        ):
+            await self._flush_acks()
 
-        await queue_instance.delete()
+    async def _flush_acks(self) -> None:
+        """Send the pending acknowledgements, if any, in one `ack(multiple=True)`."""
+        last_finished = self._last_finished
+        if last_finished is not None:
+            self._last_finished, self._unacked = None, 0
+            await last_finished.ack(multiple=True)
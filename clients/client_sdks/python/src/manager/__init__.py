@@ -1,4 +1,4 @@
-from manager.client import ManagerClient, ManagerStates
+from manager.client import ManagerClient, ManagerStates, create_connector
 from manager.config import ManagerConfig
 
-__all__ = ["ManagerClient", "ManagerConfig", "ManagerStates"]
+__all__ = ["ManagerClient", "ManagerConfig", "ManagerStates", "create_connector"]
@@ -1,9 +1,13 @@
+import asyncio
+import time
+from collections import OrderedDict
 from enum import Enum
-from typing import Optional
-from dataclasses import dataclass
+from typing import Optional, Sequence, Union
 
 from uuid import UUID
 import aiohttp as aio
+import orjson
+from yarl import URL
 
 from manager.config import ManagerConfig
 from models.task import (
@@ -13,12 +17,21 @@ from models.task import (
     TaskInstance,
 )
 
-WORKER_PATH = "/workers"
+WORKER_PATH = "workers"
 """ Base path for worker registration and unregistration endpoints."""
 
-TASK_PATH = "/tasks"
+TASK_PATH = "tasks"
 """ Base path for task CRUD operations."""
 
+HEALTH_PATH = "health"
+""" Path of the manager health check endpoint."""
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+""" Headers sent with request bodies pre-serialized with `orjson`."""
+
+STATUS_BODIES = {status: orjson.dumps(status.value) for status in TaskStatus}
+""" Pre-serialized request body of a status update, for each task status."""
+
 
 class ManagerStates(str, Enum):
     """Possible states of the manager.
@@ -36,51 +49,154 @@ class ManagerStates(str, Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+HEALTH_STATES = {200: ManagerStates.HEALTHY, 503: ManagerStates.UNHEALTHY}
+""" Manager state for each health check response status. Any other status is
+treated as `UNHEALTHY`."""
+
+
+def create_connector(config: ManagerConfig) -> aio.TCPConnector:
+    """Create a connection pool for talking to the manager. Pass the result to
+    several `ManagerClient`s to let them share connections and DNS cache; the
+    caller then owns it and must close it once they are all done.
+
+    ### Parameters
+    - `config`: Manager configuration providing the pool settings
+
+    ### Returns
+    - `aio.TCPConnector`: A new connector bound to the running event loop
+    """
+    return aio.TCPConnector(
+        limit=config.pool_size,
+        limit_per_host=config.pool_size,
+        keepalive_timeout=config.keepalive_timeout,
+        ttl_dns_cache=600,
+    )
+
+
 class ManagerClient:
-    """Abstracts the manager API for worker registration and unregistration."""
+    """Abstracts the manager API for worker registration and unregistration.
+
+    A single `aiohttp.ClientSession` is created lazily on first use and shared
+    by every call, so connections to the manager are pooled and kept alive
+    instead of being re-established per request. Call `close` (or use the
+    client as an async context manager) to release it.
+
+    By default each client owns its connection pool. A `connector` from
+    `create_connector` can be passed instead to share one pool between
+    clients; closing the client then leaves the connector open.
+    """
 
     config: ManagerConfig
+    _connector: Optional[aio.BaseConnector]
+    _session: Optional[aio.ClientSession]
+    _task_cache: OrderedDict[str, tuple[float, TaskInstance]]
+
+    def __init__(
+        self, config: ManagerConfig, connector: Optional[aio.BaseConnector] = None
+    ):
+        self.config = config
+        self._connector = connector
+        self._session = None
+        self._task_cache = OrderedDict()
+
+        # Parsed once, per-call URLs are derived with `joinpath` which is
+        # cheaper than having aiohttp re-parse a formatted string every time
+        base_url = URL(config.url)
+        self._health_url = base_url.joinpath(HEALTH_PATH)
+        self._tasks_url = base_url.joinpath(TASK_PATH)
+        self._workers_url = base_url.joinpath(WORKER_PATH)
+
+    async def __aenter__(self) -> "ManagerClient":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def _get_session(self) -> aio.ClientSession:
+        """Get the shared session, creating it on first use.
+
+        ### Returns
+        - `aio.ClientSession`: The session shared by all manager calls.
+        """
+        if self._session is None or self._session.closed:
+            if self._connector is None:
+                self._session = aio.ClientSession(
+                    timeout=self.config.timeout,
+                    connector=create_connector(self.config),
+                )
+            else:
+                self._session = aio.ClientSession(
+                    timeout=self.config.timeout,
+                    connector=self._connector,
+                    connector_owner=False,
+                )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared session and its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     # Check whether the manager is healthy
 
     async def check_health(self) -> ManagerStates:
         """Check whether the manager is healthy. This is currently used before
         tests are run to notify the user if the manager is not healthy or even
-        running at all.
+        running at all. Uses a `HEAD` request since only the status matters.
 
         ### Returns
         - `ManagerStates`: Whether the manager is healthy.
         """
         try:
-            async with aio.ClientSession(timeout=self.config.timeout) as session:
-                async with session.get(f"{self.config.url}/health") as resp:
-                    match resp.status:
-                        case 200:
-                            return ManagerStates.HEALTHY
-                        case 503:
-                            return ManagerStates.UNHEALTHY
-                        case _:
-                            return ManagerStates.UNHEALTHY
+            session = await self._get_session()
+            async with session.head(self._health_url) as resp:
+                return HEALTH_STATES.get(resp.status, ManagerStates.UNHEALTHY)
         except aio.ClientConnectorError:
             return ManagerStates.NOT_REACHABLE
 
     # Task Get/Set Operations
 
-    async def get_task(self, task_id: UUID) -> TaskInstance:
+    async def get_task(self, task_id: UUID, use_cache: bool = True) -> TaskInstance:
         """Get a task by its UUID.
 
+        Fetched tasks are cached in a small LRU cache and served from it for
+        `task_cache_ttl` seconds, whether they have finished or not: the
+        manager does not prevent finished tasks from changing status again.
+        Updating a task through this client evicts it.
+
         ### Parameters
         - `task_id`: UUID of the task to retrieve
+        - `use_cache`: Whether a cached copy of the task may be returned. The
+          fetched task is cached either way.
 
         ### Returns
         - `TaskInstance`: The task details
         """
-        async with aio.ClientSession(timeout=self.config.timeout) as session:
-            async with session.get(f"{self.config.url}{TASK_PATH}/{task_id}") as resp:
+        task_key = str(task_id)
+        now = time.monotonic()
+
+        cached = self._task_cache.get(task_key) if use_cache else None
+        if cached is not None:
+            fetched_at, task = cached
+            if now - fetched_at < self.config.task_cache_ttl:
+                self._task_cache.move_to_end(task_key)
+                return task
+
+        session = await self._get_session()
+        async with session.get(self._tasks_url.joinpath(task_key)) as resp:
+            if resp.status >= 400:
                 resp.raise_for_status()
-                data = await resp.json()
-                return TaskInstance.from_dict(data)
+            data = orjson.loads(await resp.read())
+            task = TaskInstance.from_dict(data)
+
+        if self.config.task_cache_size > 0:
+            self._task_cache[task_key] = (now, task)
+            self._task_cache.move_to_end(task_key)
+            if len(self._task_cache) > self.config.task_cache_size:
+                self._task_cache.popitem(last=False)
+
+        return task
 
     async def publish_task(
         self, task_kind_name: str, input_data: Optional[TaskInput] = None
@@ -94,14 +210,53 @@ class ManagerClient:
         ### Returns
         - `TaskInstance`: The created task details
         """
-        async with aio.ClientSession(timeout=self.config.timeout) as session:
-            async with session.post(
-                f"{self.config.url}{TASK_PATH}",
-                json={"task_kind_name": task_kind_name, "input_data": input_data},
-            ) as resp:
+        session = await self._get_session()
+        async with session.post(
+            self._tasks_url,
+            data=orjson.dumps(
+                {"task_kind_name": task_kind_name, "input_data": input_data}
+            ),
+            headers=JSON_HEADERS,
+        ) as resp:
+            if resp.status >= 400:
                 resp.raise_for_status()
-                data = await resp.json()
-                return TaskInstance.from_dict(data)
+            data = orjson.loads(await resp.read())
+            return TaskInstance.from_dict(data)
+
+    async def publish_tasks(
+        self, tasks: list[tuple[str, Optional[TaskInput]]]
+    ) -> list[Union[TaskInstance, BaseException]]:
+        """Create several tasks at once. The requests are sent concurrently,
+        at most `pool_size` of them at a time so that none of them waits for a
+        pooled connection while its timeout is running. Publishing N tasks
+        therefore costs about N / `pool_size` round trips instead of N.
+
+        Each task is created independently, so the call can partially succeed:
+        a failed request does not stop or undo the others. Failures are
+        returned in place of their task instead of being raised.
+
+        ### Parameters
+        - `tasks`: Pairs of task kind name and optional input data
+
+        ### Returns
+        - `list[TaskInstance | BaseException]`: The created task details, or the
+          error that creating the task raised, in the same order as `tasks`
+        """
+        slots = asyncio.Semaphore(self.config.pool_size)
+
+        async def publish(task_kind_name: str, input_data: Optional[TaskInput]):
+            async with slots:
+                return await self.publish_task(task_kind_name, input_data)
+
+        return list(
+            await asyncio.gather(
+                *(
+                    publish(task_kind_name, input_data)
+                    for task_kind_name, input_data in tasks
+                ),
+                return_exceptions=True,
+            )
+        )
 
     async def update_task_status(self, task_id: UUID, status: TaskStatus) -> None:
         """Update the status of a task.
@@ -110,32 +265,45 @@ class ManagerClient:
         - `task_id`: UUID of the task to update
         - `status`: New status for the task
         """
-        async with aio.ClientSession(timeout=self.config.timeout) as session:
-            async with session.put(
-                f"{self.config.url}{TASK_PATH}/{task_id}/status", json=status.value
-            ) as resp:
+        task_key = str(task_id)
+        self._task_cache.pop(task_key, None)
+
+        session = await self._get_session()
+        async with session.put(
+            self._tasks_url.joinpath(task_key, "status"),
+            data=STATUS_BODIES[status],
+            headers=JSON_HEADERS,
+        ) as resp:
+            if resp.status >= 400:
                 resp.raise_for_status()
 
     async def update_task_result(
         self, task_id: UUID, data: TaskOutput, is_error: bool = False
     ) -> None:
-        """Submit results or error for a task.
+        """Submit results or error for a task. The manager also marks the task
+        as `COMPLETED` (or `FAILED` if `is_error`) in the same transaction, so
+        no separate `update_task_status` call is needed to finish a task.
 
         ### Parameters
         - `task_id`: UUID of the task to update
         - `data`: Result data or error message
         - `is_error`: Whether this is an error result
         """
-        async with aio.ClientSession(timeout=self.config.timeout) as session:
-            async with session.put(
-                f"{self.config.url}{TASK_PATH}/{task_id}/result",
-                json={"data": data, "is_error": is_error},
-            ) as resp:
+        task_key = str(task_id)
+        self._task_cache.pop(task_key, None)
+
+        session = await self._get_session()
+        async with session.put(
+            self._tasks_url.joinpath(task_key, "result"),
+            data=orjson.dumps({"data": data, "is_error": is_error}),
+            headers=JSON_HEADERS,
+        ) as resp:
+            if resp.status >= 400:
                 resp.raise_for_status()
 
     # Worker registration and unregistration
 
-    async def register_worker(self, name: str, task_kinds: list[str]) -> UUID:
+    async def register_worker(self, name: str, task_kinds: Sequence[str]) -> UUID:
         """Register a new worker with the manager service. Called on worker startup.
 
         ### Parameters
@@ -146,14 +314,16 @@ class ManagerClient:
         - `UUID`: The ID of the registered worker.
         """
 
-        async with aio.ClientSession(timeout=self.config.timeout) as session:
-            async with session.post(
-                f"{self.config.url}{WORKER_PATH}",
-                json={"name": name, "task_kinds": task_kinds},
-            ) as resp:
+        session = await self._get_session()
+        async with session.post(
+            self._workers_url,
+            data=orjson.dumps({"name": name, "task_kinds": task_kinds}),
+            headers=JSON_HEADERS,
+        ) as resp:
+            if resp.status >= 400:
                 resp.raise_for_status()
-                data = await resp.json()
-                return UUID(data["id"])
+            data = orjson.loads(await resp.read())
+            return UUID(data["id"])
 
     async def unregister_worker(self, worker_id: UUID) -> None:
         """Unregister an existing worker. Called on graceful worker shutdown.
@@ -161,8 +331,7 @@ class ManagerClient:
         ### Parameters
         - `worker_id`: The ID of the worker to unregister.
         """
-        async with aio.ClientSession(timeout=self.config.timeout) as session:
-            async with session.delete(
-                f"{self.config.url}{WORKER_PATH}/{worker_id}"
-            ) as resp:
+        session = await self._get_session()
+        async with session.delete(self._workers_url.joinpath(str(worker_id))) as resp:
+            if resp.status >= 400:
                 resp.raise_for_status()
@@ -9,7 +9,21 @@ class ManagerConfig:
 
     ### Attributes
     - `url`: The URL of the manager.
+    - `timeout`: Timeout applied to every request to the manager.
+    - `pool_size`: Maximum number of pooled connections to the manager. Should
+      be at least the worker's `max_concurrency` so concurrent task updates do
+      not queue up waiting for a connection.
+    - `keepalive_timeout`: Seconds an idle pooled connection is kept open for
+      reuse before it is closed.
+    - `task_cache_ttl`: Seconds a fetched task is served from the client's
+      cache before it is fetched again.
+    - `task_cache_size`: Maximum number of tasks kept in the client's cache.
+      Set to `0` to disable caching.
     """
 
     url: str
     timeout: aio.ClientTimeout = aio.ClientTimeout(total=10)
+    pool_size: int = 128
+    keepalive_timeout: float = 300
+    task_cache_ttl: float = 0.5
+    task_cache_size: int = 1024
@@ -4,6 +4,12 @@ from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
 
+try:
+    # Optional C parser, considerably faster than `datetime.fromisoformat`
+    from ciso8601 import parse_datetime
+except ImportError:
+    parse_datetime = datetime.fromisoformat
+
 
 TaskInput = dict[str, Any]  # Maps to Option<serde_json::Value>
 TaskOutput = dict[str, Any]  # Maps to Option<serde_json::Value>
@@ -41,22 +47,44 @@ class TaskStatus(str, Enum):
     BLOCKED = "blocked"
 
 
-@dataclass
+FINISHED_STATUSES = frozenset(
+    {
+        TaskStatus.COMPLETED,
+        TaskStatus.FAILED,
+        TaskStatus.CANCELLED,
+        TaskStatus.TIMEOUT,
+        TaskStatus.REJECTED,
+    }
+)
+""" Terminal statuses, after which a task no longer changes."""
+
+TASK_STATUS_BY_NAME = {
+    name: status
+    for status in TaskStatus
+    for name in (status.value, status.value.capitalize(), status.name)
+}
+""" Statuses by the spellings the manager may use for them (`"completed"`,
+`"Completed"` and `"COMPLETED"`), so decoding needs no string conversion."""
+
+
+@dataclass(slots=True, frozen=True)
 class TaskResult:
     """Task results contain the output or error data from a completed task.
+    Task handlers can also return one to report a failure without raising.
 
     ### Parameters
     - `data`: The data of the task.
     - `is_error`: Whether the task failed.
-    - `created_at`: The time the task was created.
+    - `created_at`: The time the manager stored the result, `None` for
+      results returned by task handlers.
 
     ### Methods
     - `from_dict`: Creates a TaskResult from a dictionary.
     """
 
     data: Optional[TaskOutput]
-    is_error: bool
-    created_at: datetime
+    is_error: bool = False
+    created_at: Optional[datetime] = None
 
     @staticmethod
     def from_dict(data: dict[str, Any]) -> "TaskResult":
@@ -68,11 +96,11 @@ class TaskResult:
         return TaskResult(
             data=output_data,
             is_error=is_error,
-            created_at=datetime.fromisoformat(data["created_at"]),
+            created_at=parse_datetime(data["created_at"]),
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TaskInstance:
     """Tasks are sent to workers to be executed with a specific payload.
     Workers are eligible for receiving certain tasks depending on their
@@ -106,13 +134,7 @@ class TaskInstance:
 
     @property
     def has_finished(self) -> bool:
-        return self.status in [
-            TaskStatus.COMPLETED,
-            TaskStatus.FAILED,
-            TaskStatus.CANCELLED,
-            TaskStatus.TIMEOUT,
-            TaskStatus.REJECTED,
-        ]
+        return self.status in FINISHED_STATUSES
 
     @property
     def has_completed(self) -> bool:
@@ -130,8 +152,9 @@ class TaskInstance:
             id=UUID(data["id"]),
             task_kind=data["task_kind"]["name"],
             input_data=data["input_data"],
-            status=TaskStatus(data["status"].lower()),
-            created_at=datetime.fromisoformat(data["created_at"]),
+            status=TASK_STATUS_BY_NAME.get(data["status"])
+            or TaskStatus(data["status"].lower()),
+            created_at=parse_datetime(data["created_at"]),
             assigned_to=UUID(data["assigned_to"]) if data["assigned_to"] else None,
             result=TaskResult.from_dict(data["result"]) if data["result"] else None,
         )
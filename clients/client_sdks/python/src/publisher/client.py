@@ -1,4 +1,6 @@
 import asyncio
+import random
+from typing import Union
 from uuid import UUID
 
 from dataclasses import dataclass
@@ -6,6 +8,19 @@ from dataclasses import dataclass
 from manager import ManagerClient, ManagerConfig
 from models.task import TaskInput, TaskInstance
 
+POLL_INITIAL_DELAY = 0.1
+""" Seconds waited before the first re-check of a task that is being polled."""
+
+POLL_MAX_DELAY = 5.0
+""" Upper bound, in seconds, for the wait between two polls of a task."""
+
+POLL_BACKOFF = 1.5
+""" Factor the wait between polls grows by after each unfinished poll."""
+
+POLL_JITTER = 0.25
+""" Maximum random seconds added to each wait so publishers do not poll the
+manager in lockstep."""
+
 
 @dataclass
 class PublisherClient:
@@ -17,7 +32,9 @@ class PublisherClient:
 
     ### Methods
     - `publish_task`: Publish a task to the manager.
+    - `publish_tasks`: Publish several tasks to the manager at once.
     - `get_task`: Get the status of a task by its UUID.
+    - `close`: Close the connection to the manager.
     """
 
     manager_config: ManagerConfig
@@ -40,9 +57,30 @@ class PublisherClient:
 
         return await self._manager_client.publish_task(task_kind, input_data)
 
+    async def publish_tasks(
+        self, tasks: list[tuple[str, TaskInput]]
+    ) -> list[Union[TaskInstance, BaseException]]:
+        """Publish several tasks to the manager at once. Tasks are published
+        independently, so some can fail while the others are published.
+
+        ### Arguments
+        - `tasks`: Pairs of task kind and the data to publish.
+
+        ### Returns
+        - `list[TaskInstance | BaseException]`: The task instances, or the error
+          raised when publishing each one, in the same order.
+        """
+
+        return await self._manager_client.publish_tasks(tasks)
+
     async def get_task(self, task_id: UUID, long_poll: bool = False) -> TaskInstance:
         """Get the status of a task by its UUID.
 
+        When long polling, the wait between polls starts short and grows with
+        exponential backoff and random jitter up to `POLL_MAX_DELAY`, so quick
+        tasks are picked up promptly while long ones are polled rarely. Polls
+        bypass the manager client's task cache.
+
         ### Arguments
         - `task_id`: The UUID of the task.
         - `long_poll`: Whether to long poll for the task to finish.
@@ -54,8 +92,15 @@ class PublisherClient:
         task = await self._manager_client.get_task(task_id)
 
         if long_poll:
+            delay = POLL_INITIAL_DELAY
             while not task.has_finished:
-                await asyncio.sleep(1)
-                task = await self._manager_client.get_task(task_id)
+                await asyncio.sleep(delay + random.uniform(0, POLL_JITTER))
+                delay = min(POLL_MAX_DELAY, delay * POLL_BACKOFF)
+                task = await self._manager_client.get_task(task_id, use_cache=False)
 
         return task
+
+    async def close(self):
+        """Close the connection to the manager."""
+
+        await self._manager_client.close()
@@ -1,15 +1,25 @@
 import asyncio
-from dataclasses import dataclass
-from typing import Callable, Awaitable, Optional, Dict
+import logging
+import signal
+from contextlib import aclosing
+from typing import Callable, Awaitable, Optional, Dict, Union
 
 from broker import create_broker_instance, BrokerClient
 from manager import ManagerClient
-from models.task import TaskInput, TaskOutput
+from models.task import TaskInput, TaskOutput, TaskResult
 
 from worker.config import WorkerApplicationConfig
 
+logger = logging.getLogger(__name__)
+
+SHUTDOWN_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+""" Signals that trigger a graceful shutdown of the worker application."""
+
+TaskHandler = Callable[[TaskInput], Awaitable[Union[TaskOutput, TaskResult]]]
+""" Task handler functions. A handler can return a `TaskResult` with `is_error`
+set to report an expected failure without raising an exception."""
+
 
-@dataclass
 class WorkerApplication:
     """A worker application that processes tasks from a task queue.
 
@@ -19,6 +29,10 @@ class WorkerApplication:
     - `_broker_client`: Client for communicating with the message broker
     - `_manager_client`: Client for communicating with the task manager
     - `_id`: Unique identifier assigned by the manager
+    - `_id_str`: String form of `_id`, formatted once on registration
+    - `_task_kinds`: Task kinds announced to the manager on registration
+    - `_pending_updates`: Result updates still being sent to the manager
+    - `_update_slots`: Bounds how many result updates can be in flight
 
     ### Methods
     - `register_task`: Register a task handler function for a specific task kind
@@ -26,34 +40,64 @@ class WorkerApplication:
     - `_register_worker`: Register this worker with the manager and initialize broker connection
     - `_unregister_worker`: Unregister from the manager and clean up broker connection
     - `_execute_task`: Execute a task and update its status in the manager
+    - `_run_task`: Run a resolved task handler and report its result
+    - `_start_update`: Start reporting a task's result in the background
+    - `_report_result`: Send a task's result and acknowledge its message
+    - `_on_update_done`: Release a finished result update and log its failure
+    - `_flush_updates`: Wait for result updates still being sent
     - `_listen`: Listen for tasks of a specific kind from the broker
     - `entrypoint`: Start the worker application
     """
 
+    __slots__ = (
+        "_config",
+        "_registered_tasks",
+        "_broker_client",
+        "_manager_client",
+        "_id",
+        "_id_str",
+        "_task_kinds",
+        "_pending_updates",
+        "_update_slots",
+    )
+
     _config: WorkerApplicationConfig
-    _registered_tasks: Dict[str, Callable[[TaskInput], Awaitable[TaskOutput]]]
+    _registered_tasks: Dict[str, TaskHandler]
     _broker_client: Optional[BrokerClient]
     _manager_client: ManagerClient
+    _task_kinds: tuple[str, ...]
+    _pending_updates: set[asyncio.Task]
+    _update_slots: asyncio.Semaphore
 
     def __init__(self, config: WorkerApplicationConfig):
         self._config = config
         self._id = None
+        self._id_str = None
+        self._task_kinds = ()
 
+        self._broker_client = None
         self._manager_client = ManagerClient(config.manager_config)
         self._registered_tasks = {}
 
-    def register_task(
-        self, kind: str, task: Callable[[TaskInput], Awaitable[TaskOutput]]
-    ):
+        self._pending_updates = set()
+        self._update_slots = asyncio.Semaphore(config.max_concurrency)
+
+    def register_task(self, kind: str, task: TaskHandler):
         """Register a task handler function for a specific task kind.
 
         ### Parameters
         - `kind`: Unique identifier for the task type
         - `task`: Async function that processes tasks of this kind
+
+        ### Raises
+        - `RuntimeError`: If the worker is already registered with the manager
         """
+        if self._id is not None:
+            raise RuntimeError("Tasks cannot be registered once the worker started.")
+
         self._registered_tasks[kind] = task
 
-    def task(self, kind: str) -> Callable[[TaskInput], Awaitable[TaskOutput]]:
+    def task(self, kind: str) -> TaskHandler:
         """Decorator for registering task handler functions.
 
         ### Parameters
@@ -63,7 +107,7 @@ class WorkerApplication:
         - `Callable`: Decorator function that registers the task handler
         """
 
-        def decorator(task: Callable[[TaskInput], Awaitable[TaskOutput]]):
+        def decorator(task: TaskHandler):
             self.register_task(kind, task)
             return task
 
@@ -72,19 +116,30 @@ class WorkerApplication:
     async def _register_worker(self):
         """Register this worker with the manager and initialize broker connection.
 
+        If either step fails, the manager client's session is closed again
+        before the error is raised.
+
         ### Raises
         - `ConnectionError`: If connection to manager or broker fails
         """
-        worker = await self._manager_client.register_worker(
-            self._config.name, list(self._registered_tasks.keys())
-        )
-        self._id = worker
+        # Snapshot of the kinds announced to the manager for this registration
+        self._task_kinds = tuple(self._registered_tasks)
 
-        # For this ideally we would get the broker information from the manager
-        self._broker_client = create_broker_instance(
-            self._config.broker_config, self._config.name, str(self._id)
-        )
-        await self._broker_client.connect()
+        try:
+            worker = await self._manager_client.register_worker(
+                self._config.name, self._task_kinds
+            )
+            self._id = worker
+            self._id_str = str(worker)
+
+            # For this ideally we would get the broker information from the manager
+            self._broker_client = create_broker_instance(
+                self._config.broker_config, self._config.name, self._id_str
+            )
+            await self._broker_client.connect()
+        except BaseException:
+            await self._manager_client.close()
+            raise
 
     async def _unregister_worker(self):
         """Unregister from the manager and clean up broker connection.
@@ -95,12 +150,15 @@ class WorkerApplication:
         if self._id is None:
             raise ValueError("Worker is not registered.")
 
+        await self._flush_updates()
         await self._manager_client.unregister_worker(self._id)
+        await self._manager_client.close()
         if self._broker_client:
             await self._broker_client.disconnect()
 
     async def _execute_task(self, kind: str, input_data: TaskInput, task_id: str):
-        """Execute a task and update its status in the manager.
+        """Execute a task and update its status in the manager. Unlike the
+        tasks run by `_listen`, this waits until the manager has the result.
 
         ### Parameters
         - `kind`: Type of task to execute
@@ -114,40 +172,210 @@ class WorkerApplication:
         if task_func is None:
             raise ValueError(f"Task {kind} not registered.")
 
+        update = await self._run_task(task_func, input_data, task_id)
+        await update
+
+    async def _run_task(
+        self, task_func: TaskHandler, input_data: TaskInput, task_id: str
+    ) -> asyncio.Task:
+        """Run an already resolved task handler and report its result.
+
+        The result is sent to the manager in the background so the caller can
+        move on to the next task meanwhile, and the task's message is only
+        acknowledged to the broker after that. At most `max_concurrency`
+        updates are in flight; beyond that this waits for one of them to finish.
+
+        ### Parameters
+        - `task_func`: Handler function registered for the task kind
+        - `input_data`: Input data for the task
+        - `task_id`: Unique identifier for the task
+
+        ### Returns
+        - `asyncio.Task`: The background update sending the result
+        """
         try:
-            # Check what to do with the task result
             result = await task_func(input_data)
-            await self._manager_client.update_task_result(
-                task_id, result, is_error=False
-            )
+            is_error = False
+
+            # Handlers may report failures through the result instead of raising
+            if isinstance(result, TaskResult):
+                result, is_error = result.data, result.is_error
         except Exception as e:
             # Log the exception (could improve error handling)
+            result = str(e)
+            is_error = True
+
+        return await self._start_update(task_id, result, is_error)
+
+    async def _start_update(
+        self, task_id: str, result: Optional[TaskOutput], is_error: bool
+    ) -> asyncio.Task:
+        """Start sending a task's result to the manager in the background,
+        waiting first if `max_concurrency` updates are already in flight.
+
+        ### Parameters
+        - `task_id`: Unique identifier for the task
+        - `result`: Output of the task, or the error message if it failed
+        - `is_error`: Whether the task failed
+
+        ### Returns
+        - `asyncio.Task`: The background update sending the result
+        """
+        await self._update_slots.acquire()
+
+        update = asyncio.create_task(
+            self._report_result(task_id, result, is_error), name=str(task_id)
+        )
+        self._pending_updates.add(update)
+        update.add_done_callback(self._on_update_done)
+        return update
+
+    async def _report_result(
+        self, task_id: str, result: Optional[TaskOutput], is_error: bool
+    ):
+        """Send a task's result to the manager, then acknowledge its message.
+
+        The message is acknowledged even if the update fails: the task did run,
+        and redelivering it would run it a second time.
+
+        ### Parameters
+        - `task_id`: Unique identifier for the task
+        - `result`: Output of the task, or the error message if it failed
+        - `is_error`: Whether the task failed
+        """
+        try:
+            # Submitting the result also moves the task to COMPLETED/FAILED
             await self._manager_client.update_task_result(
-                task_id, str(e), is_error=True
+                task_id, result, is_error=is_error
             )
+        finally:
+            await self._broker_client.ack(task_id)
+
+    def _on_update_done(self, update: asyncio.Task):
+        """Release the slot of a finished result update, logging it if it failed.
+
+        ### Parameters
+        - `update`: The finished update, named after the task it reports
+        """
+        self._pending_updates.discard(update)
+        self._update_slots.release()
+
+        if not update.cancelled():
+            error = update.exception()
+            if error is not None:
+                logger.error(
+                    "Failed to report the result of task %s",
+                    update.get_name(),
+                    exc_info=error,
+                )
+
+    async def _flush_updates(self):
+        """Wait for all result updates that are still being sent to the manager.
+        Failed updates are logged by `_on_update_done` and do not stop the
+        worker from shutting down."""
+        await asyncio.gather(*self._pending_updates, return_exceptions=True)
 
     async def _listen(self):
         """Listen for tasks of a specific kind from the broker.
 
+        Received tasks are put on a bounded queue that `max_concurrency`
+        consumers drain concurrently, so fetching the next message overlaps
+        with running tasks and reporting their results. When listening stops,
+        the broker subscription is closed first, then the tasks still queued
+        or running are finished so that their results are reported to the
+        manager. A task of an unregistered kind is reported as failed without
+        stopping the worker.
+
         ### Raises
         - `RuntimeError`: If broker client is not initialized
         """
         if not self._broker_client:
             raise RuntimeError("Broker client is not initialized.")
 
-        async for input_data, task_id, task_kind in self._broker_client.listen():
-            await self._execute_task(task_kind, input_data, task_id)
+        max_concurrency = self._config.max_concurrency
+        queue: asyncio.Queue[tuple[Callable, TaskInput, str]] = asyncio.Queue(
+            maxsize=max_concurrency
+        )
+
+        # Hoisted out of the loop, the task registry is fixed once registered
+        get_task_func = self._registered_tasks.get
+        run_task = self._run_task
+        start_update = self._start_update
+
+        async def consume():
+            while True:
+                task_func, input_data, task_id = await queue.get()
+                try:
+                    await run_task(task_func, input_data, task_id)
+                finally:
+                    queue.task_done()
+
+        consumers = [asyncio.create_task(consume()) for _ in range(max_concurrency)]
+
+        try:
+            # Closed explicitly so the broker stops delivering and hands back
+            # buffered messages before the remaining tasks are drained
+            async with aclosing(self._broker_client.listen()) as messages:
+                async for input_data, task_id, task_kind in messages:
+                    task_func = get_task_func(task_kind)
+                    if task_func is None:
+                        # Fail only this task, the others keep running
+                        error = f"Task {task_kind} not registered."
+                        await start_update(task_id, error, True)
+                        continue
+
+                    await queue.put((task_func, input_data, task_id))
+        finally:
+            try:
+                await queue.join()
+            finally:
+                for consumer in consumers:
+                    consumer.cancel()
+                await asyncio.gather(*consumers, return_exceptions=True)
+                await self._flush_updates()
 
     async def entrypoint(self):
         """Start the worker application.
 
         This method registers the worker, starts listening for tasks,
-        and handles graceful shutdown.
+        and handles graceful shutdown. `SIGINT` and `SIGTERM` stop listening,
+        let in-flight tasks finish and then unregister the worker.
+
+        Any asyncio event loop can run it. With the `speedups` extra installed,
+        `uvloop.run(worker.entrypoint())` gives faster broker and manager I/O.
+        Unless the loop already has a custom task factory, tasks are started
+        eagerly while the worker runs, so tasks that complete without
+        suspending skip a round trip through the event loop.
         """
         await self._register_worker()
+
+        loop = asyncio.get_running_loop()
+        task_factory = loop.get_task_factory()
+        if task_factory is None:
+            loop.set_task_factory(asyncio.eager_task_factory)
+
+        listen_task = asyncio.create_task(self._listen())
+
+        for sig in SHUTDOWN_SIGNALS:
+            try:
+                loop.add_signal_handler(sig, listen_task.cancel)
+            except NotImplementedError:
+                # Signal handlers are not available on every platform (Windows)
+                pass
+
         try:
-            await self._listen
+            await listen_task
         except asyncio.CancelledError:
-            pass
+            # Only swallow the cancellation if it came from a shutdown signal
+            current_task = asyncio.current_task()
+            if current_task is not None and current_task.cancelling():
+                raise
         finally:
+            for sig in SHUTDOWN_SIGNALS:
+                try:
+                    loop.remove_signal_handler(sig)
+                except NotImplementedError:
+                    pass
+            loop.set_task_factory(task_factory)
+
             await self._unregister_worker()
@@ -14,8 +14,10 @@ class WorkerApplicationConfig:
     - `name`: The name of the worker.
     - `broker_config`: Configuration for the broker.
     - `manager_config`: Configuration for the manager.
+    - `max_concurrency`: Maximum number of tasks executed at the same time.
     """
 
     name: str
     broker_config: BrokerConfig
     manager_config: ManagerConfig
+    max_concurrency: int = 64
@@ -0,0 +1,90 @@
+from broker import BrokerConfig, RabbitMQBroker
+from contextlib import aclosing
+import orjson
+import pytest
+
+TASK_KIND = "test_task_kind"
+
+
+class FakeMessage:
+    """Incoming message that records the acknowledgements sent for it."""
+
+    def __init__(self, tag: int, calls: list):
+        self.message_id = str(tag)
+        self.headers = {"task_kind": TASK_KIND}
+        self.body = orjson.dumps({"tag": tag})
+        self.tag = tag
+        self.calls = calls
+
+    async def ack(self, multiple: bool = False):
+        self.calls.append(("ack", self.tag, multiple))
+
+    async def nack(self, requeue: bool = True):
+        self.calls.append(("nack", self.tag))
+
+
+class FakeQueue:
+    """Queue that delivers all of its messages as soon as it is consumed."""
+
+    def __init__(self, messages: list[FakeMessage]):
+        self.messages = messages
+
+    async def consume(self, callback):
+        for message in self.messages:
+            await callback(message)
+        return "consumer"
+
+    async def cancel(self, consumer_tag: str):
+        pass
+
+
+def create_broker(count: int, ack_batch_size: int = 32):
+    """Create a broker whose queue holds `count` messages, with the list of
+    acknowledgements it sends."""
+    calls = []
+    config = BrokerConfig(url="amqp://localhost", ack_batch_size=ack_batch_size)
+    broker = RabbitMQBroker(config, "test_exchange", "test_worker")
+    broker.queue = FakeQueue([FakeMessage(tag, calls) for tag in range(count)])
+    return broker, calls
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_tasks_are_acked_individually():
+    """Tests that a slow task does not hold back the acks of newer tasks."""
+    broker, calls = create_broker(10)
+
+    async with aclosing(broker.listen()) as messages:
+        task_ids = [(await anext(messages))[1] for _ in range(10)]
+
+        # The oldest task is still running while all the others finish
+        for task_id in task_ids[1:]:
+            await broker.ack(task_id)
+        assert calls == [("ack", tag, False) for tag in range(1, 10)]
+
+        await broker.ack(task_ids[0])
+        assert calls[-1] == ("ack", 0, True)
+
+    assert len(calls) == 10
+
+
+@pytest.mark.asyncio
+async def test_in_order_tasks_are_acked_in_batches():
+    """Tests that tasks finishing in order share one `ack(multiple=True)`, and
+    that messages that were never yielded are requeued."""
+    broker, calls = create_broker(10, ack_batch_size=4)
+
+    async with aclosing(broker.listen()) as messages:
+        task_ids = [(await anext(messages))[1] for _ in range(6)]
+
+        for task_id in task_ids[:3]:
+            await broker.ack(task_id)
+        assert calls == []
+
+        await broker.ack(task_ids[3])
+        assert calls == [("ack", 3, True)]
+
+        # Acks still pending when listening stops are flushed
+        await broker.ack(task_ids[4])
+        assert calls == [("ack", 3, True)]
+
+    assert calls[1:] == [("nack", tag) for tag in range(6, 10)] + [("ack", 4, True)]
@@ -1,4 +1,4 @@
-from src.manager import ManagerClient, ManagerStates
+from src.manager import ManagerClient, ManagerConfig, ManagerStates, create_connector
 import pytest
 
 
@@ -11,3 +11,25 @@ async def test_health_check_client(manager_client: ManagerClient):
     assert (
         health_state == ManagerStates.HEALTHY
     ), f"Manager is not healthy. Current state: {health_state}"
+
+
+@pytest.mark.asyncio
+async def test_health_check_shared_connector(manager_config: ManagerConfig):
+    """Tests that several manager clients can share one connection pool, and that
+    closing a client leaves the shared pool open for the others."""
+
+    connector = create_connector(manager_config)
+
+    try:
+        first = ManagerClient(manager_config, connector=connector)
+        second = ManagerClient(manager_config, connector=connector)
+
+        assert await first.check_health() == ManagerStates.HEALTHY
+        await first.close()
+
+        assert not connector.closed
+        assert await second.check_health() == ManagerStates.HEALTHY
+        await second.close()
+
+    finally:
+        await connector.close()
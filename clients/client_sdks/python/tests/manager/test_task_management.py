@@ -1,5 +1,7 @@
-from src.manager import ManagerClient
+from src.manager import ManagerClient, ManagerConfig
 from src.models.task import TaskStatus
+import asyncio
+import aiohttp
 import pytest
 from uuid import UUID, uuid4
 
@@ -69,6 +71,200 @@ async def test_task_error_result(manager_client: ManagerClient):
         await manager_client.unregister_worker(worker_id)
 
 
+@pytest.mark.asyncio
+async def test_publish_tasks(manager_client: ManagerClient):
+    """Tests publishing several tasks at once."""
+
+    # NOTE - We use a random UUID for the task kind to avoid conflicts in parallel tests
+    TEST_TASK_KIND = str(uuid4())
+    TEST_WORKER_NAME = str(uuid4())
+
+    worker_id = await manager_client.register_worker(TEST_WORKER_NAME, [TEST_TASK_KIND])
+
+    try:
+        inputs = [{"index": i} for i in range(5)]
+        tasks = await manager_client.publish_tasks(
+            [(TEST_TASK_KIND, input_data) for input_data in inputs]
+        )
+
+        assert [task.input_data for task in tasks] == inputs
+        assert all(task.task_kind == TEST_TASK_KIND for task in tasks)
+        assert len({task.id for task in tasks}) == len(inputs)
+
+    finally:
+        await manager_client.unregister_worker(worker_id)
+
+
+@pytest.mark.asyncio
+async def test_publish_tasks_partial_failure(manager_client: ManagerClient):
+    """Tests that a failing task does not prevent the others from being published,
+    and that its error is returned in its place."""
+
+    # NOTE - We use a random UUID for the task kind to avoid conflicts in parallel tests
+    TEST_TASK_KIND = str(uuid4())
+    UNHANDLED_TASK_KIND = str(uuid4())
+    TEST_WORKER_NAME = str(uuid4())
+
+    worker_id = await manager_client.register_worker(TEST_WORKER_NAME, [TEST_TASK_KIND])
+
+    try:
+        # No worker can handle the second task, so the manager rejects it
+        first, failed, last = await manager_client.publish_tasks(
+            [
+                (TEST_TASK_KIND, {"index": 0}),
+                (UNHANDLED_TASK_KIND, {"index": 1}),
+                (TEST_TASK_KIND, {"index": 2}),
+            ]
+        )
+
+        assert isinstance(failed, aiohttp.ClientResponseError)
+        assert first.input_data == {"index": 0}
+        assert last.input_data == {"index": 2}
+
+        # The tasks that were accepted are published regardless of the failure
+        assert (await manager_client.get_task(first.id)).task_kind == TEST_TASK_KIND
+        assert (await manager_client.get_task(last.id)).task_kind == TEST_TASK_KIND
+
+    finally:
+        await manager_client.unregister_worker(worker_id)
+
+
+@pytest.mark.asyncio
+async def test_publish_tasks_bounded_by_pool_size(
+    manager_client: ManagerClient, manager_config: ManagerConfig
+):
+    """Tests that publishing more tasks than pooled connections sends at most
+    `pool_size` requests at a time."""
+
+    # NOTE - We use a random UUID for the task kind to avoid conflicts in parallel tests
+    TEST_TASK_KIND = str(uuid4())
+    TEST_WORKER_NAME = str(uuid4())
+
+    worker_id = await manager_client.register_worker(TEST_WORKER_NAME, [TEST_TASK_KIND])
+
+    try:
+        config = ManagerConfig(url=manager_config.url, pool_size=2)
+        async with ManagerClient(config) as client:
+            in_flight = max_in_flight = 0
+            publish_task = client.publish_task
+
+            async def counting_publish_task(task_kind_name, input_data):
+                nonlocal in_flight, max_in_flight
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                try:
+                    return await publish_task(task_kind_name, input_data)
+                finally:
+                    in_flight -= 1
+
+            client.publish_task = counting_publish_task
+
+            tasks = await client.publish_tasks(
+                [(TEST_TASK_KIND, {"index": i}) for i in range(10)]
+            )
+
+        assert [task.input_data for task in tasks] == [{"index": i} for i in range(10)]
+        assert max_in_flight == config.pool_size
+
+    finally:
+        await manager_client.unregister_worker(worker_id)
+
+
+@pytest.mark.asyncio
+async def test_finished_task_cache_expires(
+    manager_client: ManagerClient, manager_config: ManagerConfig
+):
+    """Tests that a cached finished task is served from the cache within the
+    TTL, and fetched again once its cache entry expires so status changes made
+    by other clients become visible."""
+
+    # NOTE - We use a random UUID for the task kind to avoid conflicts in parallel tests
+    TEST_TASK_KIND = str(uuid4())
+    TEST_WORKER_NAME = str(uuid4())
+
+    worker_id = await manager_client.register_worker(TEST_WORKER_NAME, [TEST_TASK_KIND])
+
+    try:
+        task = await manager_client.publish_task(TEST_TASK_KIND, {"test": "data"})
+        await manager_client.update_task_result(task.id, {"result": "success"})
+
+        task = await manager_client.get_task(task.id)
+        assert task.has_completed
+
+        # Another client moves the finished task on, without touching our cache
+        async with ManagerClient(manager_config) as other_client:
+            await other_client.update_task_status(task.id, TaskStatus.RETRYING)
+
+        # Within the TTL the cached task is returned
+        cached = await manager_client.get_task(task.id)
+        assert cached is task
+
+        await asyncio.sleep(manager_client.config.task_cache_ttl)
+
+        task = await manager_client.get_task(task.id)
+        assert task.status == TaskStatus.RETRYING
+
+    finally:
+        await manager_client.unregister_worker(worker_id)
+
+
+@pytest.mark.asyncio
+async def test_task_updates_evict_cache(manager_client: ManagerClient):
+    """Tests that updating a task through the client evicts its cached copy,
+    so the update is visible right away."""
+
+    # NOTE - We use a random UUID for the task kind to avoid conflicts in parallel tests
+    TEST_TASK_KIND = str(uuid4())
+    TEST_WORKER_NAME = str(uuid4())
+
+    worker_id = await manager_client.register_worker(TEST_WORKER_NAME, [TEST_TASK_KIND])
+
+    try:
+        task = await manager_client.publish_task(TEST_TASK_KIND, {"test": "data"})
+        task = await manager_client.get_task(task.id)
+        assert task.status != TaskStatus.RUNNING
+
+        await manager_client.update_task_status(task.id, TaskStatus.RUNNING)
+        task = await manager_client.get_task(task.id)
+        assert task.status == TaskStatus.RUNNING
+
+        await manager_client.update_task_result(task.id, {"result": "success"})
+        task = await manager_client.get_task(task.id)
+        assert task.has_completed
+        assert task.result is not None
+        assert task.result.data == {"result": "success"}
+
+    finally:
+        await manager_client.unregister_worker(worker_id)
+
+
+@pytest.mark.asyncio
+async def test_get_task_bypassing_cache(
+    manager_client: ManagerClient, manager_config: ManagerConfig
+):
+    """Tests that `use_cache=False` fetches the task even while it is cached."""
+
+    # NOTE - We use a random UUID for the task kind to avoid conflicts in parallel tests
+    TEST_TASK_KIND = str(uuid4())
+    TEST_WORKER_NAME = str(uuid4())
+
+    worker_id = await manager_client.register_worker(TEST_WORKER_NAME, [TEST_TASK_KIND])
+
+    try:
+        task = await manager_client.publish_task(TEST_TASK_KIND, {"test": "data"})
+        task = await manager_client.get_task(task.id)
+        assert task.status != TaskStatus.RUNNING
+
+        async with ManagerClient(manager_config) as other_client:
+            await other_client.update_task_status(task.id, TaskStatus.RUNNING)
+
+        task = await manager_client.get_task(task.id, use_cache=False)
+        assert task.status == TaskStatus.RUNNING
+
+    finally:
+        await manager_client.unregister_worker(worker_id)
+
+
 @pytest.mark.asyncio
 async def test_get_nonexistent_task(manager_client: ManagerClient):
     """Tests getting a task that doesn't exist."""
@@ -1,4 +1,5 @@
 from worker import WorkerApplication
+from models.task import TaskResult
 from manager import ManagerClient
 import pytest
 from uuid import uuid4
@@ -14,6 +15,10 @@ async def successful_task(input_data):
     return input_data
 
 
+async def rejecting_task(input_data):
+    return TaskResult(data={"reason": "Task rejected"}, is_error=True)
+
+
 @pytest.mark.asyncio
 async def test_worker_startup_and_task_success(
     worker_application: WorkerApplication, manager_client: ManagerClient
@@ -78,3 +83,36 @@ async def test_worker_task_failure_handling(
 
     finally:
         await worker_application._unregister_worker()
+
+
+@pytest.mark.asyncio
+async def test_worker_task_error_result_handling(
+    worker_application: WorkerApplication, manager_client: ManagerClient
+):
+    """Tests that a task can report a failure by returning an error result."""
+    TEST_TASK_KIND = str(uuid4())
+
+    # Start worker
+    worker_application.register_task(TEST_TASK_KIND, rejecting_task)
+    await worker_application._register_worker()
+
+    try:
+        # Create and fetch a task
+        input_data = {"test": "data"}
+        await manager_client.publish_task(TEST_TASK_KIND, input_data)
+
+        data, task_id, task_kind = await anext(
+            worker_application._broker_client.listen()
+        )
+        assert input_data == data
+
+        # This should execute the task with the given function
+        await worker_application._execute_task(task_kind, data, task_id)
+
+        # Check that the task failed with the returned error data
+        task = await manager_client.get_task(task_id)
+        assert task.has_failed
+        assert task.result.data == {"reason": "Task rejected"}
+
+    finally:
+        await worker_application._unregister_worker()